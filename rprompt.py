@@ -19,25 +19,84 @@ This script does the following step-by-step:
 """
 
 import argparse
+import io
 import json
 import os
 import sys
-import time
 import threading
 import atexit
+import weakref
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Union, TYPE_CHECKING
 
-try:
-    import google.generativeai as genai
+if TYPE_CHECKING:
     from PIL import Image
-    from dotenv import load_dotenv
-    import webbrowser
-    from urllib.parse import quote
-except ImportError as e:
-    print(f"Missing required dependency: {e}")
-    print("Install with: pip install google-generativeai pillow python-dotenv")
-    sys.exit(1)
+
+# Heavy dependencies are imported where they are used so that the help path
+# does not pay for loading google.generativeai (grpc/protobuf) at startup.
+_REQUIRED_MODULES = ("google.generativeai", "PIL", "dotenv")
+
+
+def _check_dependencies():
+    """Exit with an install hint if a required dependency is missing."""
+    for name in _REQUIRED_MODULES:
+        try:
+            found = importlib.util.find_spec(name) is not None
+        except ImportError:
+            found = False
+        if not found:
+            print(f"Missing required dependency: No module named '{name}'")
+            print("Install with: pip install google-generativeai pillow python-dotenv")
+            sys.exit(1)
+
+
+# Read once at import; ~/.env is only parsed when the variable is not set
+_API_KEY = os.environ.get("GEMINI_API_KEY")
+
+
+def _get_api_key() -> Optional[str]:
+    """Return GEMINI_API_KEY, falling back to ~/.env on first use."""
+    global _API_KEY
+    if _API_KEY is None:
+        from dotenv import load_dotenv
+        load_dotenv(Path.home() / ".env")
+        _API_KEY = os.environ.get("GEMINI_API_KEY")
+    return _API_KEY
+
+
+_PROMPT_TEXT = (
+    "Generate a single paragraph prompt that could be used to recreate this image. "
+    "Include the main subject, artistic style, composition, colors, lighting, and mood "
+    "in a flowing descriptive paragraph. Focus on being comprehensive but concise."
+)
+
+# Finish reasons that mean the content was blocked (SAFETY, RECITATION)
+_BLOCKED_REASONS = frozenset((3, 4))
+
+# Static help text so the no-argument path never builds the ArgumentParser;
+# keep in sync with the arguments defined in main()
+_HELP = """\
+usage: {prog} image [image ...] [--open]
+
+Generate descriptive prompts from images using Google Gemini 2.5 Flash
+
+positional arguments:
+  image       Path to the image file(s), or - to read one from stdin
+
+options:
+  -h, --help  show this help message and exit
+  --open      Copy prompt to clipboard and open Google AI Studio in browser
+"""
+
+# Concurrent Gemini requests when prompting several images at once
+_MAX_WORKERS = 8
+
+# Gemini downsamples images internally, so larger uploads only cost bandwidth
+_MAX_IMAGE_SIDE = 1024
+_JPEG_QUALITY = 85
 
 
 # Spinner implementation
@@ -53,18 +112,25 @@ _RED   = "\033[91m"
 _RESET = "\033[0m"
 
 class Spinner:
-    def __init__(self, text="Loading...", spinner="dots", interval=0.08, stream=sys.stdout):
+    def __init__(self, text="Loading...", spinner="dots", interval=0.1, stream=sys.stdout):
         self.text = text
         self.spinner = spinner
         self.interval = interval
         self.stream = stream
+        self._cursor_hidden = False
+        _instances.add(self)
+
+        # Nothing is animated on a non-TTY stream, so skip the thread machinery
+        self._noop = not getattr(stream, "isatty", lambda: False)()
+        if self._noop:
+            return
 
         self._frames = self._get_frames(spinner)
         self._stop = threading.Event()
         self._thread = None
-        self._cursor_hidden = False
         self._render_lock = threading.Lock()
         self._last_len = 0
+        self._last_frame_idx = None
 
     def _get_frames(self, name):
         if isinstance(name, (list, tuple)) and name:
@@ -84,33 +150,36 @@ class Spinner:
             self._cursor_hidden = False
 
     def _render(self, s: str):
-        pad = max(0, self._last_len - len(s))
-        self.stream.write("\r" + s + (" " * pad))
+        self.stream.write("\r" + s.ljust(self._last_len))
         self.stream.flush()
         self._last_len = len(s)
 
     def _loop(self):
         i = 0
+        lines = [f"{frame} {self.text}" for frame in self._frames]
+        n = len(lines)
+        wait = self._stop.wait
         self._hide_cursor()
         while not self._stop.is_set():
-            frame = self._frames[i % len(self._frames)]
-            line = f"{frame} {self.text}"
-            with self._render_lock:
-                self._render(line)
+            idx = i % n
+            if idx != self._last_frame_idx:
+                with self._render_lock:
+                    self._render(lines[idx])
+                self._last_frame_idx = idx
             i += 1
-            end = time.time() + self.interval
-            while time.time() < end:
-                if self._stop.is_set():
-                    break
-                time.sleep(0.01)
+            if wait(self.interval):
+                break
 
     def _clear_line(self):
         self._render("")
         self.stream.write("\r")
         self.stream.flush()
         self._last_len = 0
+        self._last_frame_idx = None
 
     def start(self):
+        if self._noop:
+            return self
         if self._thread and self._thread.is_alive():
             return self
         self._stop.clear()
@@ -119,6 +188,8 @@ class Spinner:
         return self
 
     def stop(self):
+        if self._noop:
+            return
         self._stop.set()
         if self._thread:
             self._thread.join()
@@ -128,12 +199,18 @@ class Spinner:
 
     def succeed(self, text="Done."):
         self.stop()
-        self.stream.write(f"{_GREEN}✔{_RESET} {text}\n\n")
+        if self._noop:
+            self.stream.write(f"✔ {text}\n\n")
+        else:
+            self.stream.write(f"{_GREEN}✔{_RESET} {text}\n\n")
         self.stream.flush()
 
     def fail(self, text="Failed."):
         self.stop()
-        self.stream.write(f"{_RED}✖{_RESET} {text}\n")
+        if self._noop:
+            self.stream.write(f"✖ {text}\n")
+        else:
+            self.stream.write(f"{_RED}✖{_RESET} {text}\n")
         self.stream.flush()
 
     def __enter__(self):
@@ -145,102 +222,185 @@ class Spinner:
         else:
             self.succeed("Done.")
 
-_instances = []
+_instances = weakref.WeakSet()
 def _restore_all():
-    for sp in _instances:
+    try:
+        spinners = list(_instances)
+    except RuntimeError:
+        return
+    for sp in spinners:
         try:
             sp._show_cursor()
         except Exception:
             pass
 atexit.register(_restore_all)
 
+def _copy_to_clipboard(text: str) -> bool:
+    """Copy text to the clipboard; return True only if the copy is confirmed."""
+    if sys.platform == "darwin":
+        import subprocess
+        try:
+            if subprocess.run(['pbcopy'], input=text.encode('utf-8'), check=False).returncode == 0:
+                return True
+        except OSError:
+            pass
+    
+    try:
+        import pyperclip
+        pyperclip.copy(text)
+        return True
+    except Exception:
+        pass
+    
+    if sys.stdout.isatty():
+        # OSC 52 asks the terminal itself to set the clipboard (works over SSH),
+        # but terminals that do not support it ignore it silently
+        import base64
+        payload = base64.b64encode(text.encode("utf-8")).decode("ascii")
+        sys.stdout.write(f"\x1b]52;c;{payload}\x07")
+        sys.stdout.flush()
+        return False
+    
+    raise RuntimeError("no clipboard tool available (install pyperclip)")
+
+
 def open_browser_with_prompt(prompt_text: str):
     """Open Google AI Studio and copy prompt to clipboard for easy pasting."""
+    import webbrowser
+
     try:
-        import subprocess
-        # Copy to clipboard (macOS)
-        process = subprocess.Popen(['pbcopy'], stdin=subprocess.PIPE)
-        process.communicate(prompt_text.encode('utf-8'))
+        copied = _copy_to_clipboard(prompt_text)
         
         webbrowser.open("https://aistudio.google.com/prompts/new_image")
-        print(f"\nPrompt copied to clipboard! At Google AI Studio:")
-        print("1. Paste the prompt (Cmd+V)")
-        print("2. Check 'Run settings' for Aspect Ratio and other options")
-        print("3. Click 'Run' to generate")
-        print("\nhttps://aistudio.google.com/prompts/new_image")
-        print()
+        if copied:
+            header = "\nPrompt copied to clipboard! At Google AI Studio:"
+        else:
+            header = "\nPrompt sent to your terminal's clipboard (if supported). At Google AI Studio:"
+        print("\n".join([
+            header,
+            "1. Paste the prompt (Cmd+V)",
+            "2. Check 'Run settings' for Aspect Ratio and other options",
+            "3. Click 'Run' to generate",
+            "\nhttps://aistudio.google.com/prompts/new_image",
+        ]), end="\n\n")
         
     except Exception as e:
-        print(f"Could not copy to clipboard: {e}")
         webbrowser.open("https://aistudio.google.com/prompts/new_image")
-        print(f"\nPlease copy and paste this prompt:\n\n{prompt_text}")
-        print("Then go to: https://aistudio.google.com/prompts/new_image")
-        print()
+        print("\n".join([
+            f"Could not copy to clipboard: {e}",
+            f"\nPlease copy and paste this prompt:\n\n{prompt_text}",
+            "Then go to: https://aistudio.google.com/prompts/new_image",
+        ]), end="\n\n")
 
 
 class ReversePrompter:
     def __init__(self, model: str = "gemini-2.5-flash"):
         """Initialize the reverse prompter with API configuration."""
-        # Load environment variables from ~/.env
-        load_dotenv(os.path.expanduser("~/.env"))
-        
-        self.api_key = os.getenv("GEMINI_API_KEY")
+        import google.generativeai as genai
+
+        self.api_key = _get_api_key()
         self.model = model
         
         if not self.api_key:
             raise ValueError("Gemini API key not found. Set GEMINI_API_KEY in ~/.env file")
         
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
+        # Configure Gemini; the REST transport keeps one pooled HTTP session
+        # per client, so repeated calls on self.client reuse the connection
+        genai.configure(api_key=self.api_key, transport="rest")
         self.client = genai.GenerativeModel(self.model)
 
-    def validate_image(self, image_path: str) -> bool:
-        """Validate that the file is a supported image format."""
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Image file not found: {image_path}")
+    def _open_image(self, source: Union[str, bytes]) -> "Image.Image":
+        """Validate and load an image from a file path or raw bytes in a single pass."""
+        if isinstance(source, bytes):
+            name = "<stdin>"
+            fp = io.BytesIO(source)
+        else:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Image file not found: {source}")
+            name = fp = source
         
-        try:
-            with Image.open(image_path) as img:
-                img.verify()
-            return True
-        except Exception as e:
-            raise ValueError(f"Invalid image file {image_path}: {e}")
+        from PIL import Image, UnidentifiedImageError
 
-    def load_image(self, image_path: str) -> Image.Image:
-        """Load and return PIL Image object."""
         try:
-            return Image.open(image_path)
-        except Exception as e:
-            raise ValueError(f"Failed to load image {image_path}: {e}")
-
-    def generate_prompt(self, image_path: str) -> str:
-        """Generate a descriptive prompt from an image."""
-        self.validate_image(image_path)
-        image = self.load_image(image_path)
+            img = Image.open(fp)
+        except UnidentifiedImageError as e:
+            # PIL's message embeds the BytesIO repr for in-memory input
+            detail = "cannot identify image data" if isinstance(source, bytes) else e
+            raise ValueError(f"Invalid image file {name}: {detail}")
+        except OSError as e:
+            raise ValueError(f"Invalid image file {name}: {e}")
         
-        prompt_text = "Generate a single paragraph prompt that could be used to recreate this image. Include the main subject, artistic style, composition, colors, lighting, and mood in a flowing descriptive paragraph. Focus on being comprehensive but concise."
+        try:
+            # Let JPEGs decode at reduced scale; _shrink_image finishes the resize
+            img.draft("RGB", (_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE))
+            img.load()
+        except OSError as e:
+            img.close()
+            raise ValueError(f"Invalid image file {name}: {e}")
+        return img
+
+    def _shrink_image(self, image: "Image.Image") -> "Image.Image":
+        """Downsize and flatten the image to keep the upload payload small."""
+        from PIL import Image, ImageOps
+
+        # Apply the EXIF Orientation to the pixels; the JPEG re-encode drops the tag
+        ImageOps.exif_transpose(image, in_place=True)
+        if max(image.size) > _MAX_IMAGE_SIDE:
+            image.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+        if image.mode not in ("RGB", "L"):
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            if has_alpha:
+                # Composite onto white so transparent areas don't turn black
+                rgba = image.convert("RGBA")
+                converted = Image.new("RGB", rgba.size, (255, 255, 255))
+                converted.paste(rgba, mask=rgba.getchannel("A"))
+                rgba.close()
+            else:
+                converted = image.convert("RGB")
+            image.close()
+            image = converted
+        return image
+
+    def _encode_image(self, image: "Image.Image") -> dict:
+        """Encode the image once as a JPEG blob and release its pixel buffer."""
+        buf = io.BytesIO()
+        try:
+            image.save(buf, format="JPEG", quality=_JPEG_QUALITY)
+        finally:
+            image.close()
+        return {"mime_type": "image/jpeg", "data": buf.getvalue()}
+
+    def generate_prompt(self, source: Union[str, bytes], show_spinner: bool = True) -> str:
+        """Generate a descriptive prompt from an image path or raw image bytes."""
+        image = self._open_image(source)
+        image = self._shrink_image(image)
+        # Encoded up front so retries reuse the bytes and pixels are freed early
+        blob = self._encode_image(image)
+        del image
         
         try:
             # Generate content with Gemini - try simple approach first
-            with Spinner("Analyzing image with Gemini", spinner="dots") as spinner:
-                response = self.client.generate_content([prompt_text, image])
+            spinner = Spinner("Analyzing image with Gemini", spinner="dots") if show_spinner else nullcontext()
+            with spinner:
+                response = self.client.generate_content([_PROMPT_TEXT, blob])
             
-            # Handle response parts properly
             if not response.candidates:
                 raise RuntimeError("No response candidates from Gemini API")
             
             candidate = response.candidates[0]
             
-            # Check for blocked content
-            if hasattr(candidate, 'finish_reason') and candidate.finish_reason:
-                if candidate.finish_reason in [3, 4]:  # SAFETY or RECITATION
-                    raise RuntimeError(f"Content was blocked by safety filters")
+            # Check for blocked content before trusting any partial text
+            if getattr(candidate, 'finish_reason', None) in _BLOCKED_REASONS:
+                raise RuntimeError(f"Content was blocked by safety filters")
             
-            # Try simple text accessor first
+            # Fast path: the SDK's text accessor covers almost every response
             try:
-                if response.text and response.text.strip():
-                    return response.text.strip()
-            except:
+                text = response.text.strip()
+                if text:
+                    return text
+            except (AttributeError, ValueError):
                 pass  # Fall back to parts method
             
             # Fallback to parts method
@@ -258,16 +418,40 @@ class ReversePrompter:
         except Exception as e:
             raise RuntimeError(f"Gemini API request failed: {e}")
 
+    def generate_prompts(self, image_paths: List[Union[str, bytes]]) -> List[Union[str, Exception]]:
+        """Generate prompts for several images concurrently, in input order.
+
+        A failing image yields its exception in place of a prompt, so one bad
+        file does not discard the results for the rest of the batch.
+        """
+        def generate(path):
+            try:
+                return self.generate_prompt(path, show_spinner=False)
+            except Exception as e:
+                return e
+
+        workers = min(_MAX_WORKERS, len(image_paths)) or 1
+        # Status goes to stderr so stdout carries only the JSON results
+        with Spinner(f"Analyzing {len(image_paths)} images with Gemini", spinner="dots", stream=sys.stderr):
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(generate, image_paths))
+
 
 def main():
+    # Show help if no arguments provided
+    if len(sys.argv) == 1 or sys.argv[1] in ("-h", "--help"):
+        print(_HELP.format(prog=os.path.basename(sys.argv[0])))
+        sys.exit(0)
+    
     parser = argparse.ArgumentParser(
-        usage="%(prog)s image [--open]",
+        usage="%(prog)s image [image ...] [--open]",
         description="Generate descriptive prompts from images using Google Gemini 2.5 Flash",
         formatter_class=argparse.RawTextHelpFormatter
     )
     parser.add_argument(
         "image",
-        help="Path to the image file"
+        nargs="+",
+        help="Path to the image file(s), or - to read one from stdin"
     )
     parser.add_argument(
         "--open",
@@ -275,27 +459,42 @@ def main():
         help="Copy prompt to clipboard and open Google AI Studio in browser"
     )
     
-    # Show help if no arguments provided
-    if len(sys.argv) == 1:
-        parser.print_help()
-        print()
-        sys.exit(0)
-    
     args = parser.parse_args()
+    if args.open and len(args.image) > 1:
+        parser.error("--open supports a single image")
+    if args.image.count("-") > 1:
+        parser.error("stdin (-) can only be given once")
+    if "-" in args.image and sys.stdin.isatty():
+        parser.error("stdin (-) is a terminal; pipe image data in, e.g. cat image.png | rprompt.py -")
+    _check_dependencies()
     
     try:
         prompter = ReversePrompter()
-        prompt = prompter.generate_prompt(args.image)
+        # "-" reads the image straight from stdin, e.g. a screenshot pipeline
+        sources = [sys.stdin.buffer.read() if path == "-" else path for path in args.image]
+        
+        if len(args.image) > 1:
+            prompts = prompter.generate_prompts(sources)
+            results = [
+                {"image": path, "error": str(prompt)} if isinstance(prompt, Exception)
+                else {"image": path, "prompt": prompt}
+                for path, prompt in zip(args.image, prompts)
+            ]
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            if any("error" in result for result in results):
+                sys.exit(1)
+            return
         
+        prompt = prompter.generate_prompt(sources[0])
         
+        sys.stdout.write(f"Prompt:\n{prompt}\n")
         if args.open:
-            print(f"Prompt:\n{prompt}")
             open_browser_with_prompt(prompt)
         else:
-            print(f"Prompt:\n{prompt}")
-            print("\nYou can use the prompt at: https://aistudio.google.com/prompts/new_image")
-            print("Or run with --open to automatically open it in your browser.")
-            print()
+            sys.stdout.write(
+                "\nYou can use the prompt at: https://aistudio.google.com/prompts/new_image\n"
+                "Or run with --open to automatically open it in your browser.\n\n"
+            )
             
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)